@@ -3,29 +3,31 @@ Smart Resume Analyzer - Main Application
 Enhanced with Supabase integration and modular architecture
 """
 
-import os
+import hashlib
 import pandas as pd
 import streamlit as st
 import nltk
 from nltk.corpus import stopwords
 import time
 import datetime
-import spacy
 import random
-from streamlit_tags import st_tags
-import plotly.express as px
 
 # Import configurations and services
 from config.settings import (
     APP_NAME, CATEGORY_MAPPING, ENABLE_SUMMARIZATION,
     ENABLE_COURSE_RECOMMENDATIONS, ENABLE_NER_EXTRACTION, validate_config
 )
-from database.db_manager import get_db_manager
+from database.db_manager import (
+    get_db_manager, get_db_executor, cached_get_all_resumes, cached_get_statistics,
+    clear_query_caches
+)
 from services.ml_service import get_ml_service
-from services.skill_extraction import SkillExtractor
+from services.skill_extraction import get_skill_extractor, extract_combined_cached
 from services.text_processing import clean_text_general
-from utils.file_handlers import read_pdf, read_docx, get_file_extension, save_uploaded_file
-from utils.ui_helpers import display_skills_as_badges, display_metric_card, display_course_recommendations
+from utils.file_handlers import extract_text_cached, save_uploaded_file
+from utils.ui_helpers import (
+    display_skills_as_badges, display_metric_card, display_course_recommendations, dataframe_to_csv_bytes
+)
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -56,16 +58,22 @@ download_nltk_data()
 
 # --- Load spaCy Model ---
 @st.cache_resource
-def load_spacy_model(model_name="en_core_web_sm"):
+def load_spacy_model(model_name="en_core_web_sm",
+                     exclude=("tagger", "parser", "attribute_ruler", "lemmatizer", "senter")):
+    # Skill extraction only reads doc.ents, so everything except NER is excluded
     try:
-        nlp = spacy.load(model_name)
+        import spacy
+        nlp = spacy.load(model_name, exclude=list(exclude))
         return nlp, True, None
     except OSError:
         return None, False, f"spaCy model '{model_name}' not found. Run: python -m spacy download {model_name}"
     except Exception as e:
         return None, False, f"Error loading spaCy model: {e}"
 
-nlp, spacy_loaded, spacy_error = load_spacy_model()
+# spaCy and its model are only imported and loaded when NER extraction is enabled
+nlp, spacy_loaded, spacy_error = None, False, None
+if ENABLE_NER_EXTRACTION:
+    nlp, spacy_loaded, spacy_error = load_spacy_model()
 
 # --- Load Summarization Pipeline ---
 summarizer_pipeline = None
@@ -75,8 +83,8 @@ if ENABLE_SUMMARIZATION:
     @st.cache_resource
     def load_summarizer():
         try:
-            from transformers import pipeline
-            summarizer = pipeline("summarization", model="sshleifer/distilbart-cnn-6-6", truncation=True)
+            from services.summarization import load_summarization_pipeline
+            summarizer = load_summarization_pipeline()
             return summarizer, True, None
         except Exception as e:
             return None, False, f"Error loading summarization: {e}"
@@ -85,10 +93,24 @@ if ENABLE_SUMMARIZATION:
     if not summarizer_enabled:
         st.sidebar.warning("Summarization disabled")
 
+@st.cache_data(max_entries=64, show_spinner=False)
+def summarize_texts(texts: tuple) -> list:
+    """Summarize cleaned texts in one batched pipeline call, cached on the inputs."""
+    outputs = summarizer_pipeline(
+        list(texts),
+        max_length=130,
+        min_length=30,
+        do_sample=False,
+        batch_size=len(texts),
+        truncation=True
+    )
+    return [output['summary_text'] for output in outputs]
+
 # --- Initialize Services ---
 db_manager = get_db_manager()
+db_executor = get_db_executor()
 ml_service = get_ml_service()
-skill_extractor = SkillExtractor(nlp if spacy_loaded else None)
+skill_extractor = get_skill_extractor(nlp if spacy_loaded else None)
 
 # Initialize categories in database
 if db_manager.is_connected:
@@ -170,11 +192,45 @@ def recommend_courses(category_name: str, num_recommendations: int = 4):
     if not course_list:
         return []
     
-    # Shuffle for variety
-    shuffled = course_list.copy()
-    random.shuffle(shuffled)
+    # Random pick for variety
+    return random.sample(course_list, min(num_recommendations, len(course_list)))
+
+# --- Database Persistence ---
+def save_analysis_to_db(resume_details: dict, selected_file: str, resume_skills: list,
+                        job_description: str, jd_skills: list, match_result: dict):
+    """Save extracted skills, the job description and the match result for a resume."""
+    # Use the ID recorded at upload, falling back to an exact filename lookup
+    resume_id = resume_details.get('resume_id')
+    if resume_id is None:
+        resume_id = db_manager.get_resume_id_by_filename(selected_file)
+    if resume_id is None:
+        return
+    
+    # Save skills
+    db_manager.insert_resume_skills(
+        resume_id,
+        resume_skills,
+        'combined'
+    )
     
-    return shuffled[:num_recommendations]
+    # Save JD and match
+    jd_data = {
+        'jd_text': job_description,
+        'required_skills': jd_skills
+    }
+    jd_record = db_manager.client.table('job_descriptions').insert(jd_data).execute()
+    
+    if jd_record.data:
+        jd_id = jd_record.data[0]['id']
+        
+        match_data = {
+            'resume_id': resume_id,
+            'jd_id': jd_id,
+            'match_score': match_result['score'],
+            'matching_skills': match_result['matching_skills'],
+            'missing_skills': match_result['missing_skills']
+        }
+        db_manager.insert_jd_match(match_data)
 
 # ===================================
 # HOME PAGE
@@ -249,75 +305,81 @@ elif app_mode == '👤 User Analysis':
             st.stop()
         
         categorization_data = []
+        extracted_files = []
         progress_bar = st.progress(0)
         status_text = st.empty()
-        
+        num_files = len(uploaded_files)
+        # Refresh the progress widgets about 20 times per batch rather than for every file
+        update_every = max(1, num_files // 20)
+
+        # Pass 1: extract text from every uploaded file
         for i, uploaded_file in enumerate(uploaded_files):
             file_name = uploaded_file.name
-            file_ext = get_file_extension(file_name)
-            
-            status_text.text(f"Processing {file_name}...")
-            
+            show_progress = i % update_every == 0 or i == num_files - 1
+
+            if show_progress:
+                status_text.text(f"Processing {file_name} ({i + 1}/{num_files})...")
+
             try:
-                # Save temp file
-                temp_path = os.path.join(".", f"temp_{file_name}")
-                uploaded_file.seek(0)
-                
-                with open(temp_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-                
+                # Hash the content once; it keys the extraction cache and is stored with the resume
+                file_bytes = uploaded_file.getvalue()
+                file_hash = hashlib.sha256(file_bytes).hexdigest()
+
                 # Extract text
-                text = ""
-                if file_ext == '.pdf':
-                    text = read_pdf(temp_path)
-                elif file_ext == '.docx':
-                    uploaded_file.seek(0)
-                    text = read_docx(uploaded_file)
-                
+                text = extract_text_cached(file_hash, file_name, file_bytes)
+
                 if text:
-                    # Predict category
-                    category_name, category_id, confidence = ml_service.predict_category(text)
-                    
-                    # Store in session state
-                    st.session_state.uploaded_file_details[file_name] = {
-                        'text': text,
-                        'category': category_name,
-                        'category_id': category_id,
-                        'confidence': confidence
-                    }
-                    
-                    # Add to results
-                    categorization_data.append({
-                        'Filename': file_name,
-                        'Predicted Category': category_name,
-                        'Confidence': f"{confidence:.2f}%" if confidence > 0 else "N/A"
-                    })
-                    
-                    # Save to database
-                    resume_data = {
-                        'filename': file_name,
-                        'original_text': text,
-                        'file_path': None  # No local path in cloud deployment
-                    }
-                    resume_record = db_manager.insert_resume(resume_data)
-                    
-                    if resume_record and category_id is not None:
-                        analysis_data = {
-                            'resume_id': resume_record['id'],
-                            'category_id': category_id,
-                            'confidence_score': float(confidence) if confidence else 0.0
-                        }
-                        db_manager.insert_analysis(analysis_data)
-                
-                # Cleanup temp file
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-            
+                    extracted_files.append((file_name, file_hash, text))
+
             except Exception as e:
                 st.error(f"Error processing {file_name}: {e}")
-            
-            progress_bar.progress((i + 1) / len(uploaded_files))
-        
+
+            if show_progress:
+                progress_bar.progress((i + 1) / num_files)
+
+        # Pass 2: categorize all extracted texts in a single batch
+        status_text.text("Categorizing resumes...")
+        predictions = ml_service.batch_predict([text for _, _, text in extracted_files])
+
+        # Pass 3: store results and collect database rows
+        resume_rows = []
+        for (file_name, file_hash, text), (category_name, category_id, confidence) in zip(extracted_files, predictions):
+            # Store in session state
+            st.session_state.uploaded_file_details[file_name] = {
+                'file_hash': file_hash,
+                'text': text,
+                'category': category_name,
+                'category_id': category_id,
+                'confidence': confidence
+            }
+
+            # Add to results
+            categorization_data.append({
+                'Filename': file_name,
+                'Predicted Category': category_name,
+                'Confidence': f"{confidence:.2f}%" if confidence > 0 else "N/A"
+            })
+
+            resume_rows.append({
+                'filename': file_name,
+                'file_hash': file_hash,
+                'original_text': text,
+                'file_path': None,  # No local path in cloud deployment
+                'category_id': category_id,
+                'confidence_score': float(confidence) if confidence else 0.0
+            })
+
+        # Save resumes and their analyses in one transactional call
+        status_text.text("Saving results to database...")
+        resume_ids = db_manager.ingest_resumes(resume_rows)
+        if len(resume_ids) != len(resume_rows):
+            st.error("Error saving resumes to database")
+            resume_ids = []
+
+        for (file_name, _, _), resume_id in zip(extracted_files, resume_ids):
+            st.session_state.uploaded_file_details[file_name]['resume_id'] = resume_id
+        clear_query_caches()
+
         status_text.text("✅ Categorization complete!")
         
         if categorization_data:
@@ -332,7 +394,7 @@ elif app_mode == '👤 User Analysis':
         st.subheader("📊 Categorization Results")
         st.dataframe(st.session_state['categorization_results'], use_container_width=True)
         
-        csv = st.session_state['categorization_results'].to_csv(index=False).encode('utf-8')
+        csv = dataframe_to_csv_bytes(st.session_state['categorization_results'])
         st.download_button(
             label="📥 Download Results as CSV",
             data=csv,
@@ -376,7 +438,7 @@ elif app_mode == '👤 User Analysis':
                 confidence = resume_details.get('confidence', 0)
                 
                 # Extract skills from resume
-                resume_skills = skill_extractor.extract_combined(resume_text)
+                resume_skills = extract_combined_cached(skill_extractor, resume_text)
                 
                 # Extract skills from JD
                 jd_skills = skill_extractor.extract_rule_based(job_description)
@@ -384,6 +446,14 @@ elif app_mode == '👤 User Analysis':
                 # Match skills
                 match_result = skill_extractor.match_with_jd(resume_skills, jd_skills)
                 
+                # Save to database in the background while summaries are generated
+                save_future = None
+                if db_manager.is_connected:
+                    save_future = db_executor.submit(
+                        save_analysis_to_db, resume_details, selected_file,
+                        resume_skills, job_description, jd_skills, match_result
+                    )
+                
                 # Course recommendations
                 recommended_courses = []
                 if courses_available and predicted_category not in ["Unknown", "Prediction Error"]:
@@ -394,27 +464,22 @@ elif app_mode == '👤 User Analysis':
                 jd_summary = "Summarization not available"
                 
                 if summarizer_enabled and summarizer_pipeline:
-                    try:
-                        resume_clean = clean_text_general(resume_text)[:1024]
-                        resume_summary = summarizer_pipeline(
-                            resume_clean,
-                            max_length=130,
-                            min_length=30,
-                            do_sample=False
-                        )[0]['summary_text']
-                    except Exception as e:
-                        resume_summary = f"Error: {e}"
+                    resume_clean = clean_text_general(resume_text)[:1024]
+                    jd_clean = clean_text_general(job_description)[:1024]
                     
                     try:
-                        jd_clean = clean_text_general(job_description)[:1024]
-                        jd_summary = summarizer_pipeline(
-                            jd_clean,
-                            max_length=130,
-                            min_length=30,
-                            do_sample=False
-                        )[0]['summary_text']
-                    except Exception as e:
-                        jd_summary = f"Error: {e}"
+                        resume_summary, jd_summary = summarize_texts((resume_clean, jd_clean))
+                    except Exception:
+                        # Retry each input alone so one bad input doesn't hide the other summary
+                        try:
+                            resume_summary = summarize_texts((resume_clean,))[0]
+                        except Exception as e:
+                            resume_summary = f"Error: {e}"
+                        
+                        try:
+                            jd_summary = summarize_texts((jd_clean,))[0]
+                        except Exception as e:
+                            jd_summary = f"Error: {e}"
                 
                 # Store results
                 st.session_state.analysis_output = {
@@ -431,38 +496,9 @@ elif app_mode == '👤 User Analysis':
                 }
                 st.session_state.analyze_clicked = True
                 
-                # Save to database
-                if db_manager.is_connected:
-                    # Find resume ID
-                    resumes = db_manager.search_resumes(selected_file)
-                    if resumes:
-                        resume_id = resumes[0]['id']
-                        
-                        # Save skills
-                        db_manager.insert_resume_skills(
-                            resume_id,
-                            resume_skills,
-                            'combined'
-                        )
-                        
-                        # Save JD and match
-                        jd_data = {
-                            'jd_text': job_description,
-                            'required_skills': jd_skills
-                        }
-                        jd_record = db_manager.client.table('job_descriptions').insert(jd_data).execute()
-                        
-                        if jd_record.data:
-                            jd_id = jd_record.data[0]['id']
-                            
-                            match_data = {
-                                'resume_id': resume_id,
-                                'jd_id': jd_id,
-                                'match_score': match_result['score'],
-                                'matching_skills': match_result['matching_skills'],
-                                'missing_skills': match_result['missing_skills']
-                            }
-                            db_manager.insert_jd_match(match_data)
+                # Wait for the database writes so any error surfaces here
+                if save_future is not None:
+                    save_future.result()
                 
                 st.rerun()
     
@@ -589,7 +625,7 @@ elif app_mode == '🔑 Admin Panel':
     
     # Statistics
     try:
-        stats = db_manager.get_statistics()
+        stats = cached_get_statistics()
     except Exception as e:
         st.error(f"Error loading statistics: {e}")
         stats = {}
@@ -619,41 +655,30 @@ elif app_mode == '🔑 Admin Panel':
     st.subheader("📋 All Resumes")
     
     try:
-        resumes = db_manager.get_all_resumes(limit=100)
+        resumes = cached_get_all_resumes(limit=100)
     except Exception as e:
         st.error(f"Error loading resumes: {e}")
         resumes = []
     
     if resumes:
-        # Convert to DataFrame
-        df_data = []
-        for resume in resumes:
-            analysis = resume.get('resume_analysis', [])
-            if analysis:
-                analysis = analysis[0]
-                category = analysis.get('categories')
-                if category:
-                    category_name = category.get('category_name', 'N/A')
-                else:
-                    category_name = 'N/A'
-                confidence = analysis.get('confidence_score', 0)
-            else:
-                category_name = 'N/A'
-                confidence = 0
-            
-            df_data.append({
-                'ID': resume['id'],
-                'Filename': resume['filename'],
-                'Category': category_name,
-                'Confidence': f"{float(confidence):.2f}%" if confidence else 'N/A',
-                'Upload Date': resume['upload_timestamp']
-            })
+        # Flatten the nested rows with json_normalize instead of a per-row loop
+        df_resumes = pd.json_normalize(resumes)
+        analysis = pd.json_normalize(
+            [a if isinstance(a, dict) else {} for a in df_resumes['resume_analysis'].str[0]]
+        ).reindex(columns=['confidence_score', 'categories.category_name'])
+        confidence = pd.to_numeric(analysis['confidence_score'], errors='coerce')
         
-        df_admin = pd.DataFrame(df_data)
+        df_admin = pd.DataFrame({
+            'ID': df_resumes['id'],
+            'Filename': df_resumes['filename'],
+            'Category': analysis['categories.category_name'].fillna('N/A'),
+            'Confidence': confidence.map('{:.2f}%'.format).where(confidence.fillna(0) != 0, 'N/A'),
+            'Upload Date': df_resumes['upload_timestamp']
+        })
         st.dataframe(df_admin, use_container_width=True)
         
         # Download button
-        csv = df_admin.to_csv(index=False).encode('utf-8')
+        csv = dataframe_to_csv_bytes(df_admin)
         st.download_button(
             label="📥 Download Data",
             data=csv,
@@ -665,11 +690,13 @@ elif app_mode == '🔑 Admin Panel':
         st.markdown("---")
         st.subheader("📊 Category Distribution")
         
-        category_counts = df_admin['Category'].value_counts()
-        if not category_counts.empty:
+        # Already fetched with the statistics above
+        category_counts = stats.get('category_distribution', [])
+        if category_counts:
+            import plotly.express as px
             fig = px.pie(
-                names=category_counts.index,
-                values=category_counts.values,
+                names=[row['category_name'] for row in category_counts],
+                values=[row['resume_count'] for row in category_counts],
                 title='Resume Distribution by Category'
             )
             st.plotly_chart(fig, use_container_width=True)
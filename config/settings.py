@@ -20,7 +20,16 @@ ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 # Model Paths
 TFIDF_MODEL_PATH = os.getenv("TFIDF_MODEL_PATH", "tfidf.pkl")
 ML_MODEL_PATH = os.getenv("ML_MODEL_PATH", "model.pkl")
+# Single artifact written by retrain_models.py (fitted pipeline + category names);
+# used instead of TFIDF_MODEL_PATH/ML_MODEL_PATH when present
+MODEL_ARTIFACT_PATH = os.getenv("MODEL_ARTIFACT_PATH", "artifact.joblib")
+# Compression for retrained model artifacts: "none" (memory-mappable) or "lz4"
+MODEL_COMPRESSION = os.getenv("MODEL_COMPRESSION", "none").lower()
+# Vectorizer used by retrain_models.py: "tfidf" or "hashing" (hashing + TF-IDF transformer)
+MODEL_VECTORIZER = os.getenv("MODEL_VECTORIZER", "tfidf").lower()
 SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+SUMMARIZER_MODEL = os.getenv("SUMMARIZER_MODEL", "sshleifer/distilbart-cnn-12-3")
+SUMMARIZER_CACHE_DIR = os.getenv("SUMMARIZER_CACHE_DIR", str(BASE_DIR / "model_cache"))
 
 # File Upload Settings
 MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "10"))
@@ -31,6 +40,8 @@ OUTPUT_DIRECTORY = os.getenv("OUTPUT_DIRECTORY", "categorized_resumes")
 ENABLE_SUMMARIZATION = os.getenv("ENABLE_SUMMARIZATION", "true").lower() == "true"
 ENABLE_COURSE_RECOMMENDATIONS = os.getenv("ENABLE_COURSE_RECOMMENDATIONS", "true").lower() == "true"
 ENABLE_NER_EXTRACTION = os.getenv("ENABLE_NER_EXTRACTION", "true").lower() == "true"
+# int8 classifier weights save memory only; scipy upcasts them, so scoring is not faster
+ENABLE_INT8_CLASSIFIER = os.getenv("ENABLE_INT8_CLASSIFIER", "false").lower() == "true"
 
 # Category Mapping
 CATEGORY_MAPPING = {
@@ -71,6 +82,9 @@ SKILLS_DB = [
     'pmo', 'operations management', 'business analysis', 'dotnet'
 ]
 
+# Lowercased once at import for case-insensitive matching
+SKILLS_DB_LOWER = tuple(skill.lower() for skill in SKILLS_DB)
+
 def validate_config():
     """Validate required configuration."""
     if not SUPABASE_URL or SUPABASE_URL == "your_supabase_project_url_here":
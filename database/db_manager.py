@@ -1,32 +1,32 @@
 """Supabase database manager and connection handler."""
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
 from supabase import create_client, Client
 from typing import Optional, Dict, List, Any
 from datetime import datetime
 import logging
 
-from config.settings import SUPABASE_URL, SUPABASE_KEY
+from config.settings import SUPABASE_URL, SUPABASE_KEY, CATEGORY_MAPPING
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# PostgREST / Postgres error codes meaning an RPC function does not exist
+MISSING_FUNCTION_CODES = ('PGRST202', '42883')
+
+
+def _is_missing_function(error: Exception) -> bool:
+    """Check whether an RPC failed only because the database function is not defined."""
+    return getattr(error, 'code', None) in MISSING_FUNCTION_CODES
+
 
 class SupabaseManager:
     """Manages Supabase database connections and operations."""
     
-    _instance: Optional['SupabaseManager'] = None
-    _client: Optional[Client] = None
-    
-    def __new__(cls):
-        """Singleton pattern to ensure single database connection."""
-        if cls._instance is None:
-            cls._instance = super(SupabaseManager, cls).__new__(cls)
-        return cls._instance
-    
     def __init__(self):
         """Initialize Supabase client."""
-        if self._client is None:
-            self._initialize_client()
+        self._client: Optional[Client] = None
+        self._initialize_client()
     
     def _initialize_client(self):
         """Initialize the Supabase client."""
@@ -82,33 +82,134 @@ class SupabaseManager:
             logger.error(f"Error inserting analysis: {e}")
             return None
     
+    def insert_resumes(self, rows: List[Dict[str, Any]]) -> List[Dict]:
+        """Insert multiple resume records in a single request, preserving order."""
+        if not self.is_connected:
+            logger.error("Database not connected")
+            return []
+
+        if not rows:
+            return []
+
+        try:
+            result = self._client.table('resumes').insert(rows).execute()
+            return result.data if result.data else []
+        except Exception as e:
+            logger.error(f"Error inserting resumes: {e}")
+            return []
+
+    def insert_analyses(self, rows: List[Dict[str, Any]]) -> List[Dict]:
+        """Insert multiple analysis records in a single request, preserving order."""
+        if not self.is_connected:
+            logger.error("Database not connected")
+            return []
+
+        if not rows:
+            return []
+
+        try:
+            result = self._client.table('resume_analysis').insert(rows).execute()
+            return result.data if result.data else []
+        except Exception as e:
+            logger.error(f"Error inserting analyses: {e}")
+            return []
+
+    def ingest_resumes(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """
+        Insert resumes together with their analysis in a single transaction.
+        
+        Args:
+            rows: Resume columns plus 'category_id' and 'confidence_score', and
+                optionally 'skills' and 'extraction_method'
+            
+        Returns:
+            New resume IDs in input order (empty on failure)
+        """
+        if not self.is_connected:
+            logger.error("Database not connected")
+            return []
+        
+        if not rows:
+            return []
+        
+        try:
+            result = self._client.rpc('ingest_resumes', {'p_resumes': rows}).execute()
+            return [row['new_resume_id'] for row in result.data or []]
+        except Exception as e:
+            # Any other failure (timeouts, dropped connections) may have happened after the
+            # transaction committed, so inserting again could store every resume twice
+            if not _is_missing_function(e):
+                logger.error(f"Error ingesting resumes: {e}")
+                return []
+            logger.warning(f"ingest_resumes function not defined, falling back to bulk inserts: {e}")
+        
+        # Same result without the database function: one bulk insert per table
+        resume_columns = ('filename', 'file_hash', 'original_text', 'file_path')
+        resume_records = self.insert_resumes([
+            {column: row.get(column) for column in resume_columns} for row in rows
+        ])
+        if len(resume_records) != len(rows):
+            return []
+        
+        analysis_rows = [
+            {
+                'resume_id': record['id'],
+                'category_id': row['category_id'],
+                'confidence_score': row.get('confidence_score') or 0.0
+            }
+            for row, record in zip(rows, resume_records)
+            if row.get('category_id') is not None
+        ]
+        if len(self.insert_analyses(analysis_rows)) != len(analysis_rows):
+            # Undo the resume insert rather than leave resumes without their analysis
+            self._delete_resumes([record['id'] for record in resume_records])
+            return []
+        
+        for row, record in zip(rows, resume_records):
+            if row.get('skills'):
+                self.insert_resume_skills(record['id'], row['skills'], row.get('extraction_method', 'rule_based'))
+        
+        return [record['id'] for record in resume_records]
+    
+    def _delete_resumes(self, resume_ids: List[int]):
+        """Delete resume records, e.g. to roll back a partially failed ingest."""
+        try:
+            self._client.table('resumes').delete().in_('id', resume_ids).execute()
+        except Exception as e:
+            logger.error(f"Error deleting resumes {resume_ids}: {e}")
+    
     def insert_resume_skills(self, resume_id: int, skills: List[str], method: str = 'rule_based') -> bool:
-        """Insert skills for a resume."""
+        """Insert skills for a resume with one upsert per table."""
         if not self.is_connected:
             return False
         
+        # Postgres rejects an upsert that touches the same row twice
+        skill_names = list(dict.fromkeys(skills))
+        if not skill_names:
+            return True
+        
         try:
-            # First, ensure skills exist in skills table
-            skill_ids = []
-            for skill_name in skills:
-                # Try to get or create skill
-                skill_result = self._client.table('skills').select('id').eq('skill_name', skill_name).execute()
-                
-                if skill_result.data:
-                    skill_ids.append(skill_result.data[0]['id'])
-                else:
-                    # Insert new skill
-                    new_skill = self._client.table('skills').insert({'skill_name': skill_name}).execute()
-                    if new_skill.data:
-                        skill_ids.append(new_skill.data[0]['id'])
+            # Ensure skills exist; the upsert returns the id of new and existing rows alike
+            skill_result = self._client.table('skills').upsert(
+                [{'skill_name': skill_name} for skill_name in skill_names],
+                on_conflict='skill_name'
+            ).execute()
             
-            # Insert resume-skill relationships
-            for skill_id in skill_ids:
-                self._client.table('resume_skills').insert({
+            # Insert resume-skill relationships, skipping pairs that are already stored
+            resume_skill_rows = [
+                {
                     'resume_id': resume_id,
-                    'skill_id': skill_id,
+                    'skill_id': skill['id'],
                     'extraction_method': method
-                }).execute()
+                }
+                for skill in skill_result.data or []
+            ]
+            if resume_skill_rows:
+                self._client.table('resume_skills').upsert(
+                    resume_skill_rows,
+                    on_conflict='resume_id,skill_id',
+                    ignore_duplicates=True
+                ).execute()
             
             return True
         except Exception as e:
@@ -129,13 +230,13 @@ class SupabaseManager:
     
     # Query Operations
     def get_all_resumes(self, limit: int = 100) -> List[Dict]:
-        """Get all resumes with their analysis."""
+        """Get all resumes with their analysis (listing columns only, without resume text)."""
         if not self.is_connected:
             return []
         
         try:
             result = self._client.table('resumes').select(
-                '*, resume_analysis(*, categories(category_name))'
+                'id, filename, upload_timestamp, resume_analysis(confidence_score, categories(category_name))'
             ).order('upload_timestamp', desc=True).limit(limit).execute()
             return result.data if result.data else []
         except Exception as e:
@@ -156,6 +257,20 @@ class SupabaseManager:
             logger.error(f"Error fetching resume: {e}")
             return None
     
+    def get_resume_id_by_filename(self, filename: str) -> Optional[int]:
+        """Get the ID of the most recent resume uploaded under exactly this filename."""
+        if not self.is_connected:
+            return None
+        
+        try:
+            result = self._client.table('resumes').select('id').eq(
+                'filename', filename
+            ).order('upload_timestamp', desc=True).limit(1).execute()
+            return result.data[0]['id'] if result.data else None
+        except Exception as e:
+            logger.error(f"Error fetching resume ID: {e}")
+            return None
+    
     def get_resumes_by_category(self, category_name: str) -> List[Dict]:
         """Get all resumes for a specific category."""
         if not self.is_connected:
@@ -178,15 +293,12 @@ class SupabaseManager:
         try:
             stats = {}
             
-            # Total resumes
-            total_resumes = self._client.table('resumes').select('id', count='exact').execute()
-            stats['total_resumes'] = total_resumes.count if total_resumes else 0
+            # Total resumes (HEAD request: only the count header comes back)
+            total_resumes = self._client.table('resumes').select('id', count='exact', head=True).execute()
+            stats['total_resumes'] = total_resumes.count if total_resumes and total_resumes.count else 0
             
-            # Category distribution
-            category_dist = self._client.table('resume_analysis').select(
-                'category_id, categories(category_name)', count='exact'
-            ).execute()
-            stats['category_distribution'] = category_dist.data if category_dist.data else []
+            # Category distribution, one aggregated row per category
+            stats['category_distribution'] = self.get_category_counts()
             
             # Recent activity (last 7 days)
             # This would require date filtering - simplified for now
@@ -197,11 +309,33 @@ class SupabaseManager:
             logger.error(f"Error fetching statistics: {e}")
             return {}
     
+    def get_category_counts(self) -> List[Dict]:
+        """Get resume counts per category, aggregated by the category_statistics view."""
+        if not self.is_connected:
+            return []
+        
+        try:
+            result = self._client.table('category_statistics').select(
+                'category_name, resume_count'
+            ).gt('resume_count', 0).execute()
+            return result.data if result.data else []
+        except Exception as e:
+            logger.error(f"Error fetching category counts: {e}")
+            return []
+    
     def search_resumes(self, query: str) -> List[Dict]:
-        """Search resumes by filename or content."""
+        """Search resumes by filename or content using the indexed search_resumes function."""
         if not self.is_connected:
             return []
         
+        try:
+            result = self._client.rpc('search_resumes', {'q': query}).select(
+                '*, resume_analysis(*, categories(category_name))'
+            ).execute()
+            return result.data if result.data else []
+        except Exception as e:
+            logger.warning(f"search_resumes function unavailable, falling back to ILIKE: {e}")
+        
         try:
             result = self._client.table('resumes').select(
                 '*, resume_analysis(*, categories(category_name))'
@@ -218,22 +352,20 @@ class SupabaseManager:
             return False
         
         try:
-            from config.settings import CATEGORY_MAPPING
-            
-            # Check if categories exist
-            existing = self._client.table('categories').select('id').execute()
+            # Check if categories exist (HEAD request: only the count comes back)
+            existing = self._client.table('categories').select('id', count='exact', head=True).execute()
             
-            if existing.data and len(existing.data) > 0:
-                logger.info(f"Categories already initialized ({len(existing.data)} categories found)")
+            if existing.count and existing.count >= len(CATEGORY_MAPPING):
+                logger.info(f"Categories already initialized ({existing.count} categories found)")
                 return True
             
-            # Insert all categories from CATEGORY_MAPPING
+            # Upsert all categories from CATEGORY_MAPPING, so a partial table is completed safely
             categories_data = [
                 {'id': cat_id, 'category_name': cat_name}
                 for cat_id, cat_name in CATEGORY_MAPPING.items()
             ]
             
-            result = self._client.table('categories').insert(categories_data).execute()
+            result = self._client.table('categories').upsert(categories_data, on_conflict='id').execute()
             
             if result.data:
                 logger.info(f"Successfully initialized {len(result.data)} categories")
@@ -247,7 +379,31 @@ class SupabaseManager:
             return False
 
 
-@st.cache_resource
+@st.cache_resource(ttl=None)
 def get_db_manager() -> SupabaseManager:
-    """Get or create the database manager instance (cached)."""
+    """Get or create the database manager instance (cached, one per process)."""
     return SupabaseManager()
+
+
+@st.cache_resource
+def get_db_executor() -> ThreadPoolExecutor:
+    """Get the shared thread pool for background database writes (cached)."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="db-writer")
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_get_all_resumes(limit: int = 100) -> List[Dict]:
+    """Get recent resumes with their analysis (cached for 30 seconds)."""
+    return get_db_manager().get_all_resumes(limit)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_get_statistics() -> Dict[str, Any]:
+    """Get overall statistics (cached for 60 seconds)."""
+    return get_db_manager().get_statistics()
+
+
+def clear_query_caches():
+    """Drop cached query results so new uploads show up immediately."""
+    cached_get_all_resumes.clear()
+    cached_get_statistics.clear()
@@ -163,5 +163,69 @@ LEFT JOIN resume_analysis ra ON c.id = ra.category_id
 GROUP BY c.id, c.category_name
 ORDER BY resume_count DESC;
 
+-- 11. Search Support
+-- Trigram index so filename ILIKE '%...%' searches use an index scan
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_resumes_filename_trgm ON resumes USING GIN (filename gin_trgm_ops);
+
+-- Full-text index over the resume content
+CREATE INDEX IF NOT EXISTS idx_resumes_content_fts ON resumes
+    USING GIN (to_tsvector('english', COALESCE(original_text, '')));
+
+-- Search by filename substring or resume content; filename matches come first
+CREATE OR REPLACE FUNCTION search_resumes(q TEXT, max_results INTEGER DEFAULT 100)
+RETURNS SETOF resumes
+LANGUAGE sql STABLE
+AS $$
+    SELECT *
+    FROM resumes
+    WHERE filename ILIKE '%' || q || '%'
+       OR to_tsvector('english', COALESCE(original_text, '')) @@ plainto_tsquery('english', q)
+    ORDER BY (filename ILIKE '%' || q || '%') DESC, upload_timestamp DESC
+    LIMIT max_results;
+$$;
+
+-- 12. Resume Ingestion
+-- Insert resumes with their analysis (and optional skills) in one transaction;
+-- returns the new resume ids in input order
+CREATE OR REPLACE FUNCTION ingest_resumes(p_resumes JSONB)
+RETURNS TABLE(new_resume_id INTEGER)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    item JSONB;
+    rid INTEGER;
+BEGIN
+    FOR item IN
+        SELECT value FROM jsonb_array_elements(p_resumes) WITH ORDINALITY ORDER BY ordinality
+    LOOP
+        INSERT INTO resumes (filename, file_hash, original_text, file_path)
+        VALUES (item->>'filename', item->>'file_hash', item->>'original_text', item->>'file_path')
+        RETURNING id INTO rid;
+
+        IF item->>'category_id' IS NOT NULL THEN
+            INSERT INTO resume_analysis (resume_id, category_id, confidence_score)
+            VALUES (rid, (item->>'category_id')::INTEGER, COALESCE((item->>'confidence_score')::DECIMAL(5,2), 0));
+        END IF;
+
+        IF jsonb_typeof(item->'skills') = 'array' THEN
+            WITH upserted AS (
+                INSERT INTO skills (skill_name)
+                SELECT DISTINCT jsonb_array_elements_text(item->'skills')
+                ON CONFLICT (skill_name) DO UPDATE SET skill_name = EXCLUDED.skill_name
+                RETURNING id
+            )
+            INSERT INTO resume_skills (resume_id, skill_id, extraction_method)
+            SELECT rid, upserted.id, COALESCE(item->>'extraction_method', 'rule_based')
+            FROM upserted
+            ON CONFLICT (resume_id, skill_id) DO NOTHING;
+        END IF;
+
+        new_resume_id := rid;
+        RETURN NEXT;
+    END LOOP;
+END;
+$$;
+
 -- Success message
 SELECT 'Database setup completed successfully! 🎉' as message;
@@ -0,0 +1,39 @@
+"""
+Re-save tfidf.pkl and model.pkl in joblib's uncompressed format so the app can memory-map them
+"""
+import joblib
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config.settings import TFIDF_MODEL_PATH, ML_MODEL_PATH
+
+print("="*60)
+print("RE-SAVING ML MODELS")
+print("="*60)
+
+for step, path in enumerate((TFIDF_MODEL_PATH, ML_MODEL_PATH), start=1):
+    print(f"\n{step}. {path}...")
+    if not os.path.exists(path):
+        print(f"   ✗ {path} not found!")
+        sys.exit(1)
+
+    # Plain pickles load as usual; numpy arrays are then written as raw buffers that
+    # joblib.load(..., mmap_mode='r') maps straight from disk. Protocol 5 (as in
+    # retrain_models.py) hands any other array data to pickle out-of-band, without a copy
+    obj = joblib.load(path)
+    # Write a temporary file and swap it in, so a failed write never destroys the model
+    tmp_path = path + '.tmp'
+    joblib.dump(obj, tmp_path, compress=0, protocol=5)
+    os.replace(tmp_path, path)
+    print(f"   ✓ Re-saved {type(obj).__name__} ({os.path.getsize(path)} bytes)")
+
+    # Test loading
+    joblib.load(path, mmap_mode='r')
+    print("   ✓ Memory-mapped load works")
+
+print("\n" + "="*60)
+print("✓ MODELS RE-SAVED SUCCESSFULLY!")
+print("="*60)
@@ -3,16 +3,18 @@ Retrain ML models with current scikit-learn version for compatibility
 """
 import pandas as pd
 import numpy as np
-import pickle
-from sklearn.feature_extraction.text import TfidfVectorizer
+import joblib
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
 import sys
 import os
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from config.settings import MODEL_ARTIFACT_PATH, MODEL_COMPRESSION, MODEL_VECTORIZER
 from services.text_processing import clean_resume_for_categorization
 
 print("="*60)
@@ -64,23 +66,41 @@ X_train, X_test, y_train, y_test = train_test_split(
 print(f"   ✓ Train: {len(X_train)}, Test: {len(X_test)}")
 
 # Train TF-IDF Vectorizer
-print("\n4. Training TF-IDF Vectorizer...")
-vectorizer = TfidfVectorizer(
-    max_features=1500,
-    min_df=5,
-    max_df=0.7,
-    stop_words='english',
-    ngram_range=(1, 2)
-)
+use_hashing = MODEL_VECTORIZER == 'hashing'
+if use_hashing:
+    # No vocabulary to store or look up: tokens are hashed straight to feature indices
+    print("\n4. Training Hashing + TF-IDF Vectorizer...")
+    vectorizer = Pipeline([
+        ('hash', HashingVectorizer(
+            n_features=2**14,
+            stop_words='english',
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            norm=None,
+            dtype=np.float32
+        )),
+        ('tfidf', TfidfTransformer())
+    ])
+else:
+    print("\n4. Training TF-IDF Vectorizer...")
+    vectorizer = TfidfVectorizer(
+        max_features=1500,
+        min_df=5,
+        max_df=0.7,
+        stop_words='english',
+        ngram_range=(1, 2),
+        dtype=np.float32
+    )
 X_train_tfidf = vectorizer.fit_transform(X_train)
 X_test_tfidf = vectorizer.transform(X_test)
-print(f"   ✓ Vocabulary size: {len(vectorizer.vocabulary_)}")
+if not use_hashing:
+    print(f"   ✓ Vocabulary size: {len(vectorizer.vocabulary_)}")
 print(f"   ✓ Feature shape: {X_train_tfidf.shape}")
 
 # Verify vectorizer is fitted
 from sklearn.utils.validation import check_is_fitted
 try:
-    check_is_fitted(vectorizer)
+    check_is_fitted(vectorizer[-1] if use_hashing else vectorizer)
     print(f"   ✓ Vectorizer is properly fitted")
 except:
     print(f"   ✗ Vectorizer fit verification failed!")
@@ -88,7 +108,10 @@ except:
 
 # Train Logistic Regression model
 print("\n5. Training Logistic Regression model...")
+# L1 penalty drives most weights to exactly zero, so the coefficients can be stored sparsely
 model = LogisticRegression(
+    penalty='l1',
+    solver='saga',
     max_iter=1000,
     random_state=42,
     class_weight='balanced',
@@ -97,39 +120,42 @@ model = LogisticRegression(
 model.fit(X_train_tfidf, y_train)
 print(f"   ✓ Model trained")
 
+# Compact the fitted weights to match the float32 features: float32 halves their size,
+# CSR keeps only the non-zeros
+model.coef_ = model.coef_.astype(np.float32)
+model.intercept_ = model.intercept_.astype(np.float32)
+model.sparsify()
+print(f"   ✓ Non-zero coefficients: {model.coef_.nnz} of {np.prod(model.coef_.shape)}")
+
 # Evaluate
 train_score = model.score(X_train_tfidf, y_train)
 test_score = model.score(X_test_tfidf, y_test)
 print(f"   ✓ Train accuracy: {train_score:.4f}")
 print(f"   ✓ Test accuracy: {test_score:.4f}")
 
-# Save models
+# Save the fitted pipeline and category names as a single artifact (uncompressed so the app
+# can memory-map the arrays, or LZ4 for smaller files that still decompress quickly)
 print("\n6. Saving models...")
-with open('tfidf.pkl', 'wb') as f:
-    pickle.dump(vectorizer, f, protocol=4)
-print(f"   ✓ Saved tfidf.pkl")
-
-with open('model.pkl', 'wb') as f:
-    pickle.dump(model, f, protocol=4)
-print(f"   ✓ Saved model.pkl")
-
-# Save category mapping
-with open('category_mapping.pkl', 'wb') as f:
-    pickle.dump(id_to_category, f, protocol=4)
-print(f"   ✓ Saved category_mapping.pkl")
+compress = ('lz4', 1) if MODEL_COMPRESSION == 'lz4' else 0
+vectorizer_steps = vectorizer.steps if use_hashing else [('vec', vectorizer)]
+pipeline = Pipeline(vectorizer_steps + [('clf', model)])
+joblib.dump(
+    {'pipeline': pipeline, 'id_to_category': id_to_category},
+    MODEL_ARTIFACT_PATH,
+    compress=compress,
+    protocol=5
+)
+print(f"   ✓ Saved {MODEL_ARTIFACT_PATH}")
 
 # Test loading
 print("\n7. Testing model loading...")
-with open('tfidf.pkl', 'rb') as f:
-    test_vec = pickle.load(f)
-with open('model.pkl', 'rb') as f:
-    test_model = pickle.load(f)
+mmap_mode = None if compress else 'r'
+test_artifact = joblib.load(MODEL_ARTIFACT_PATH, mmap_mode=mmap_mode)
 
 # Test prediction
 test_text = X_test.iloc[0]
-test_features = test_vec.transform([test_text])
-test_pred = test_model.predict(test_features)[0]
-test_cat = id_to_category[test_pred]
+test_pred = test_artifact['pipeline'].predict([test_text])[0]
+test_cat = test_artifact['id_to_category'][test_pred]
 print(f"   ✓ Test prediction: {test_cat}")
 
 print("\n" + "="*60)
@@ -1,15 +1,101 @@
 """Machine Learning service for resume categorization."""
-import pickle
+from collections import Counter, OrderedDict
+import hashlib
+import importlib.util
+import os
+import sys
+import threading
+import traceback
+import joblib
+from joblib import Parallel, delayed
+import numpy as np
+from scipy import sparse
+from scipy.special import logsumexp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.pipeline import Pipeline
+from sklearn.utils.validation import check_is_fitted
 import streamlit as st
 from typing import Tuple, Optional
 import logging
 
-from config.settings import TFIDF_MODEL_PATH, ML_MODEL_PATH, CATEGORY_MAPPING
+from config.settings import (
+    TFIDF_MODEL_PATH, ML_MODEL_PATH, MODEL_ARTIFACT_PATH, CATEGORY_MAPPING, ENABLE_INT8_CLASSIFIER
+)
 from services.text_processing import clean_resume_for_categorization
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Pickles written with NumPy 2 reference numpy._core; on NumPy 1.x alias it to numpy.core
+# once per process so they unpickle
+if importlib.util.find_spec('numpy._core') is None:
+    sys.modules.setdefault('numpy._core', np.core)
+    sys.modules.setdefault('numpy._core.multiarray', np.core.multiarray)
+    sys.modules.setdefault('numpy._core._multiarray_umath', np.core._multiarray_umath)
+
+# Number of cache keys (raw and cleaned resume digests) kept in the service's prediction LRU
+PREDICTION_CACHE_SIZE = 512
+# Batches at least this large clean their texts across loky worker processes
+PARALLEL_CLEANING_MIN_BATCH = 8
+
+
+def _clean_texts(resume_texts: list) -> list:
+    """Clean resume texts for categorization, in parallel for large batches."""
+    if len(resume_texts) < PARALLEL_CLEANING_MIN_BATCH:
+        return [clean_resume_for_categorization(text) for text in resume_texts]
+    # A Parallel instance cannot run concurrently, so each call (one per session thread)
+    # gets its own; loky's reusable executor keeps the worker processes warm between calls
+    parallel = Parallel(n_jobs=-1, backend='loky', batch_size='auto')
+    return parallel(delayed(clean_resume_for_categorization)(text) for text in resume_texts)
+
+
+def _text_digest(text: str, kind: bytes) -> bytes:
+    """Prediction cache key: a 16-byte BLAKE2b digest of a raw or cleaned resume text."""
+    return hashlib.blake2b(
+        text.encode('utf-8', 'surrogatepass'), digest_size=16, person=kind
+    ).digest()
+
+
+def _load_artifact(path: str):
+    """
+    Load a joblib/pickle model artifact.
+    
+    Uncompressed files (starting with the pickle protocol opcode) are memory-mapped
+    read-only; compressed dumps such as LZ4 or zlib are decompressed as usual, as is
+    any file that cannot be memory-mapped.
+    """
+    with open(path, 'rb') as f:
+        is_uncompressed = f.read(1) == b'\x80'
+    
+    if is_uncompressed:
+        try:
+            return joblib.load(path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not memory-map {path}, loading into memory: {e}")
+    
+    return joblib.load(path)
+
+
+def _is_multinomial_logistic(model) -> bool:
+    """Check whether predict_proba is a softmax over decision_function scores."""
+    if type(model).__name__ != 'LogisticRegression' or len(getattr(model, 'classes_', [])) <= 2:
+        return False
+    if getattr(model, 'multi_class', 'auto') == 'ovr':
+        return False
+    return getattr(model, 'solver', 'lbfgs') != 'liblinear'
+
+
+def _dense_coef(model) -> np.ndarray:
+    """Return the classifier weights as a dense array (sparsified models store them as CSR)."""
+    coef = model.coef_
+    return coef.toarray() if sparse.issparse(coef) else np.asarray(coef)
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    """Row-wise softmax of a 2D score matrix."""
+    exp_scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+    return exp_scores / exp_scores.sum(axis=1, keepdims=True)
+
 
 class MLCategorizationService:
     """Handles ML-based resume categorization."""
@@ -18,84 +104,244 @@ class MLCategorizationService:
         """Initialize ML service with models."""
         self.vectorizer = None
         self.model = None
+        self.id_to_category = CATEGORY_MAPPING
         self.loaded = False
         self.load_error = None
+        self._int8_coef = None
+        self._int8_scale = None
+        self._intercept = None
+        self._frozen_analyzer = None
+        self._frozen_vocabulary = None
+        self._frozen_idf = None
+        self._frozen_coef = None
+        self._frozen_intercept = None
+        self._prediction_cache: OrderedDict = OrderedDict()
+        self._prediction_cache_lock = threading.Lock()
         self._load_models()
     
     def _load_models(self):
-        """Load TF-IDF vectorizer and ML model from pickle files."""
+        """Load the vectorizer and ML model from joblib/pickle files."""
         try:
-            import numpy as np
-            import sys
-            import os
-            
-            # Check if files exist
-            if not os.path.exists(TFIDF_MODEL_PATH):
-                raise FileNotFoundError(f"TF-IDF model not found at {TFIDF_MODEL_PATH}")
-            if not os.path.exists(ML_MODEL_PATH):
-                raise FileNotFoundError(f"ML model not found at {ML_MODEL_PATH}")
-            
-            # Map numpy._core to numpy.core for backward compatibility
-            if hasattr(np, '_core') and 'numpy._core' not in sys.modules:
-                sys.modules['numpy._core'] = np._core
-                sys.modules['numpy._core.multiarray'] = np._core.multiarray
-                sys.modules['numpy._core._multiarray_umath'] = np._core._multiarray_umath
-            
-            # Load models with error handling
-            with open(TFIDF_MODEL_PATH, "rb") as f:
-                self.vectorizer = pickle.load(f)
-            with open(ML_MODEL_PATH, "rb") as f:
-                self.model = pickle.load(f)
+            # Load models with error handling; arrays in uncompressed joblib dumps are
+            # memory-mapped read-only instead of copied onto the heap
+            if os.path.exists(MODEL_ARTIFACT_PATH):
+                # Single artifact from retrain_models.py: fitted pipeline + category names
+                artifact = _load_artifact(MODEL_ARTIFACT_PATH)
+                self._use_pipeline(artifact['pipeline'])
+                self.id_to_category = artifact.get('id_to_category') or CATEGORY_MAPPING
+            else:
+                # Check if files exist
+                if not os.path.exists(ML_MODEL_PATH):
+                    raise FileNotFoundError(f"ML model not found at {ML_MODEL_PATH}")
+                
+                self.model = _load_artifact(ML_MODEL_PATH)
+                if isinstance(self.model, Pipeline):
+                    self._use_pipeline(self.model)
+                else:
+                    if not os.path.exists(TFIDF_MODEL_PATH):
+                        raise FileNotFoundError(f"TF-IDF model not found at {TFIDF_MODEL_PATH}")
+                    self.vectorizer = _load_artifact(TFIDF_MODEL_PATH)
             
             # Log model details
             logger.info("ML models loaded successfully")
             logger.info(f"Vectorizer type: {type(self.vectorizer)}")
             logger.info(f"Model type: {type(self.model)}")
             
-            # Check and fix vectorizer attributes
-            has_vocabulary = hasattr(self.vectorizer, 'vocabulary_') and self.vectorizer.vocabulary_
-            has_idf = hasattr(self.vectorizer, 'idf_') and self.vectorizer.idf_ is not None
-            
-            logger.info(f"Has vocabulary_: {has_vocabulary}")
-            logger.info(f"Has idf_: {has_idf}")
-            
-            if has_vocabulary:
-                logger.info(f"Vocabulary size: {len(self.vectorizer.vocabulary_)}")
-            
-            # If vocabulary exists but idf_ doesn't, try to fix the vectorizer
-            if has_vocabulary and not has_idf:
-                logger.warning("Vectorizer has vocabulary but missing idf_ - attempting to fix")
-                try:
-                    from sklearn.feature_extraction.text import TfidfTransformer
-                    from sklearn.utils.validation import check_is_fitted
-                    
-                    # Try to get idf_ from _tfidf attribute if it exists
-                    if hasattr(self.vectorizer, '_tfidf') and hasattr(self.vectorizer._tfidf, 'idf_'):
-                        self.vectorizer.idf_ = self.vectorizer._tfidf.idf_
-                        logger.info("Copied idf_ from _tfidf transformer")
-                        has_idf = True
-                    
-                    # Verify it's now fitted
-                    if has_idf:
-                        try:
-                            check_is_fitted(self.vectorizer)
-                            logger.info("Vectorizer is now properly fitted")
-                        except:
-                            logger.warning("Vectorizer still not fitted after fix attempt")
-                except Exception as fix_error:
-                    logger.error(f"Failed to fix vectorizer: {fix_error}")
+            # Hashing vectorizers (alone or in a pipeline) have no vocabulary/IDF to check
+            if not isinstance(self.vectorizer, (Pipeline, HashingVectorizer)):
+                self._check_tfidf_vectorizer()
             
-            if not has_vocabulary or not has_idf:
-                raise ValueError(f"Vectorizer not properly fitted: vocabulary={has_vocabulary}, idf={has_idf}")
+            # Without (working) int8 weights, score with the float weights as usual
+            if not (ENABLE_INT8_CLASSIFIER and self._quantize_classifier()):
+                self._freeze_scorer()
             
             self.loaded = True
         except FileNotFoundError as e:
-            self.load_error = f"Model files not found: {e}. Please ensure tfidf.pkl and model.pkl are in the project root."
+            self.load_error = (
+                f"Model files not found: {e}. Please ensure {MODEL_ARTIFACT_PATH} "
+                f"(or tfidf.pkl and model.pkl) is in the project root."
+            )
             logger.error(self.load_error)
         except Exception as e:
             self.load_error = f"Error loading models: {e}"
             logger.error(self.load_error)
     
+    def _use_pipeline(self, pipeline: Pipeline):
+        """Use a fitted pipeline's last step as the classifier and the rest as the vectorizer."""
+        self.model = pipeline[-1]
+        # A lone vectorizer step is used directly so the frozen TF-IDF scorer still applies
+        self.vectorizer = pipeline[0] if len(pipeline) == 2 else pipeline[:-1]
+    
+    def _check_tfidf_vectorizer(self):
+        """Check (and where possible fix) that the TF-IDF vectorizer is fitted."""
+        # Check and fix vectorizer attributes
+        has_vocabulary = hasattr(self.vectorizer, 'vocabulary_') and self.vectorizer.vocabulary_
+        has_idf = hasattr(self.vectorizer, 'idf_') and self.vectorizer.idf_ is not None
+        
+        logger.info(f"Has vocabulary_: {has_vocabulary}")
+        logger.info(f"Has idf_: {has_idf}")
+        
+        if has_vocabulary:
+            logger.info(f"Vocabulary size: {len(self.vectorizer.vocabulary_)}")
+        
+        # If vocabulary exists but idf_ doesn't, try to fix the vectorizer
+        if has_vocabulary and not has_idf:
+            logger.warning("Vectorizer has vocabulary but missing idf_ - attempting to fix")
+            try:
+                # Try to get idf_ from _tfidf attribute if it exists
+                if hasattr(self.vectorizer, '_tfidf') and hasattr(self.vectorizer._tfidf, 'idf_'):
+                    self.vectorizer.idf_ = self.vectorizer._tfidf.idf_
+                    logger.info("Copied idf_ from _tfidf transformer")
+                    has_idf = True
+                
+                # Verify it's now fitted
+                if has_idf:
+                    try:
+                        check_is_fitted(self.vectorizer)
+                        logger.info("Vectorizer is now properly fitted")
+                    except:
+                        logger.warning("Vectorizer still not fitted after fix attempt")
+            except Exception as fix_error:
+                logger.error(f"Failed to fix vectorizer: {fix_error}")
+        
+        if not has_vocabulary or not has_idf:
+            raise ValueError(f"Vectorizer not properly fitted: vocabulary={has_vocabulary}, idf={has_idf}")
+    
+    def _quantize_classifier(self) -> bool:
+        """
+        Quantize the classifier weights to int8 for the scoring matmul.
+        
+        This only shrinks the resident weights: scipy upcasts the int8 matrix to float64
+        when multiplying it with the sparse features, so scoring is not faster (and is
+        slightly less accurate) than with the float weights.
+        
+        Returns:
+            True if the int8 weights are in use, False to keep the float path
+        """
+        if not _is_multinomial_logistic(self.model):
+            logger.warning(f"INT8 scoring needs a multinomial LogisticRegression, got {type(self.model)}")
+            return False
+        
+        try:
+            coef = _dense_coef(self.model).astype(np.float32)
+            max_weight = float(np.abs(coef).max()) if coef.size else 0.0
+            if max_weight == 0.0:
+                logger.warning("All classifier weights are zero - not quantizing")
+                return False
+            
+            int8_scale = 127.0 / max_weight
+            self._int8_coef = np.ascontiguousarray(np.round(coef * int8_scale).astype(np.int8).T)
+            self._int8_scale = int8_scale
+            self._intercept = np.asarray(self.model.intercept_, dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Could not quantize classifier, using float weights: {e}")
+            self._int8_coef = None
+            return False
+        
+        logger.info(f"Quantized classifier weights to int8 (scale={self._int8_scale:.2f})")
+        return True
+    
+    def _freeze_scorer(self):
+        """Precompute vocabulary, IDF and weights so single resumes skip the sklearn transform."""
+        vectorizer = self.vectorizer
+        if not _is_multinomial_logistic(self.model):
+            logger.info(f"Frozen scorer needs a multinomial LogisticRegression, got {type(self.model)}")
+            return
+        if getattr(vectorizer, 'norm', None) not in ('l1', 'l2', None) or not hasattr(vectorizer, 'build_analyzer'):
+            logger.info("Frozen scorer does not support this vectorizer - using transform")
+            return
+        
+        try:
+            self._frozen_analyzer = vectorizer.build_analyzer()
+            self._frozen_vocabulary = dict(vectorizer.vocabulary_)
+            self._frozen_idf = (
+                np.asarray(vectorizer.idf_, dtype=np.float64)
+                if getattr(vectorizer, 'use_idf', True)
+                else np.ones(len(self._frozen_vocabulary))
+            )
+            # Feature-major layout so a resume's rows can be gathered directly
+            self._frozen_coef = np.ascontiguousarray(_dense_coef(self.model).astype(np.float64).T)
+            self._frozen_intercept = np.asarray(self.model.intercept_, dtype=np.float64)
+            logger.info("Frozen single-resume scorer ready")
+        except Exception as e:
+            logger.warning(f"Could not build frozen scorer, using transform: {e}")
+            self._frozen_coef = None
+    
+    def _score_frozen(self, cleaned_text: str) -> Tuple[int, float]:
+        """
+        Score one cleaned resume with the frozen TF-IDF weights and classifier.
+        
+        Mirrors TfidfVectorizer.transform followed by LogisticRegression.predict_proba.
+        
+        Args:
+            cleaned_text: Resume text after clean_resume_for_categorization
+            
+        Returns:
+            Tuple of (category_id, confidence percentage)
+        """
+        vocabulary = self._frozen_vocabulary
+        counts = Counter(
+            index for index in map(vocabulary.get, self._frozen_analyzer(cleaned_text))
+            if index is not None
+        )
+        
+        scores = self._frozen_intercept.copy()
+        if counts:
+            indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+            weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+            if self.vectorizer.binary:
+                weights[:] = 1.0
+            if self.vectorizer.sublinear_tf:
+                weights = np.log(weights) + 1.0
+            weights *= self._frozen_idf[indices]
+            
+            if self.vectorizer.norm == 'l2':
+                weights /= np.sqrt(weights @ weights) or 1.0
+            elif self.vectorizer.norm == 'l1':
+                weights /= np.abs(weights).sum() or 1.0
+            
+            scores += weights @ self._frozen_coef[indices]
+        
+        probabilities = _softmax(scores[np.newaxis, :])[0]
+        best = int(probabilities.argmax())
+        return int(self.model.classes_[best]), float(probabilities[best]) * 100.0
+    
+    def _predict_features(self, features) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict category IDs and confidences for a feature matrix.
+        
+        Args:
+            features: Vectorized resumes (n_samples x n_features)
+            
+        Returns:
+            Tuple of (category_ids, confidence percentages)
+        """
+        if self._int8_coef is not None:
+            scores = (features @ self._int8_coef) / self._int8_scale + self._intercept
+            probabilities = _softmax(np.asarray(scores))
+            prediction_ids = self.model.classes_[probabilities.argmax(axis=1)]
+            return prediction_ids, probabilities.max(axis=1) * 100.0
+        
+        # Multinomial logistic regression: predict_proba is a softmax over decision_function,
+        # so only the winning class' probability is computed from the raw scores
+        if _is_multinomial_logistic(self.model):
+            scores = np.asarray(self.model.decision_function(features))
+            best = scores.argmax(axis=1)
+            prediction_ids = self.model.classes_[best]
+            confidences = np.exp(scores[np.arange(len(best)), best] - logsumexp(scores, axis=1)) * 100.0
+            return prediction_ids, confidences
+        
+        # One predict_proba call gives both the class (argmax) and its confidence
+        if hasattr(self.model, 'predict_proba'):
+            probabilities = self.model.predict_proba(features)
+            best = probabilities.argmax(axis=1)
+            prediction_ids = self.model.classes_[best]
+            confidences = probabilities[np.arange(len(best)), best] * 100.0
+            return prediction_ids, confidences
+        
+        prediction_ids = self.model.predict(features)
+        return prediction_ids, np.zeros(len(prediction_ids))
+    
     def is_loaded(self) -> bool:
         """Check if models are loaded."""
         return self.loaded
@@ -110,66 +356,7 @@ class MLCategorizationService:
         Returns:
             Tuple of (category_name, category_id, confidence_score)
         """
-        if not self.loaded:
-            logger.error(f"Models not loaded. Error: {self.load_error}")
-            return "Unknown", None, 0.0
-        
-        try:
-            # Clean text
-            cleaned_text = clean_resume_for_categorization(resume_text)
-            
-            if not cleaned_text.strip():
-                logger.warning("Cleaned text is empty")
-                return "Unknown", None, 0.0
-            
-            # Log for debugging
-            logger.info(f"Attempting prediction with vectorizer type: {type(self.vectorizer)}")
-            logger.info(f"Model type: {type(self.model)}")
-            
-            # Transform and predict
-            import numpy as np
-            try:
-                # Detailed logging for debugging
-                logger.info(f"Has vocabulary_: {hasattr(self.vectorizer, 'vocabulary_')}")
-                logger.info(f"Has idf_: {hasattr(self.vectorizer, 'idf_')}")
-                logger.info(f"Has _tfidf: {hasattr(self.vectorizer, '_tfidf')}")
-                
-                if hasattr(self.vectorizer, 'vocabulary_'):
-                    logger.info(f"Vocabulary size: {len(self.vectorizer.vocabulary_)}")
-                
-                features = self.vectorizer.transform([cleaned_text])
-                logger.info(f"Text transformation successful. Feature shape: {features.shape}")
-            except Exception as transform_error:
-                logger.error(f"Transform failed: {transform_error}")
-                logger.error(f"Vectorizer type: {type(self.vectorizer)}")
-                logger.error(f"Vectorizer __dict__ keys: {list(self.vectorizer.__dict__.keys())}")
-                import traceback
-                logger.error(f"Full traceback: {traceback.format_exc()}")
-                return "Model Error", None, 0.0
-            
-            prediction_id = self.model.predict(features)[0]
-            
-            # Handle numpy types
-            if hasattr(prediction_id, 'item'):
-                prediction_id = prediction_id.item()
-            
-            # Get probability/confidence if available
-            confidence = 0.0
-            if hasattr(self.model, 'predict_proba'):
-                probabilities = self.model.predict_proba(features)[0]
-                # Get the maximum probability and convert to percentage
-                confidence = float(max(probabilities)) * 100.0
-            
-            category_name = CATEGORY_MAPPING.get(prediction_id, f"Unknown Category ({prediction_id})")
-            
-            logger.info(f"Prediction: {category_name} (ID: {prediction_id}, Confidence: {confidence:.2f}%)")
-            return category_name, int(prediction_id), confidence
-            
-        except Exception as e:
-            import traceback
-            logger.error(f"Error during prediction: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            return "Prediction Error", None, 0.0
+        return self.batch_predict([resume_text])[0]
     
     def batch_predict(self, resume_texts: list) -> list:
         """
@@ -181,12 +368,98 @@ class MLCategorizationService:
         Returns:
             List of tuples (category_name, category_id, confidence)
         """
-        results = []
-        for text in resume_texts:
-            result = self.predict_category(text)
-            results.append(result)
+        if not self.loaded:
+            logger.error(f"Models not loaded. Error: {self.load_error}")
+            return [("Unknown", None, 0.0) for _ in resume_texts]
+
+        # Resumes seen before are served by a digest of the raw text, so reruns and
+        # re-uploads skip cleaning (and its worker processes) as well as the transform
+        raw_keys = [_text_digest(text, b'raw') for text in resume_texts]
+        results = [self._get_cached_prediction(key) for key in raw_keys]
+        misses = [i for i, result in enumerate(results) if result is None]
+        if not misses:
+            return results
+
+        try:
+            cleaned_texts = _clean_texts([resume_texts[i] for i in misses])
+        except Exception as e:
+            logger.error(f"Error cleaning resumes for prediction: {e}")
+            for i in misses:
+                results[i] = ("Prediction Error", None, 0.0)
+            return results
+
+        # Texts that clean to an already scored string share its prediction
+        pending = []
+        for i, cleaned_text in zip(misses, cleaned_texts):
+            clean_key = _text_digest(cleaned_text, b'clean')
+            prediction = self._get_cached_prediction(clean_key)
+            if prediction is None:
+                pending.append((i, cleaned_text, clean_key))
+            else:
+                results[i] = prediction
+                self._cache_prediction(raw_keys[i], prediction)
+
+        if pending:
+            predictions = self._predict_cleaned([cleaned_text for _, cleaned_text, _ in pending])
+            for (i, _, clean_key), prediction in zip(pending, predictions):
+                results[i] = prediction
+                if prediction[0] != "Prediction Error":
+                    self._cache_prediction(clean_key, prediction)
+                    self._cache_prediction(raw_keys[i], prediction)
+
         return results
 
+    def _get_cached_prediction(self, key: bytes) -> Optional[tuple]:
+        """Look up a cached prediction, marking it as recently used."""
+        with self._prediction_cache_lock:
+            prediction = self._prediction_cache.get(key)
+            if prediction is not None:
+                self._prediction_cache.move_to_end(key)
+            return prediction
+
+    def _cache_prediction(self, key: bytes, prediction: tuple):
+        """Store a prediction, evicting the least recently used one when full."""
+        with self._prediction_cache_lock:
+            self._prediction_cache[key] = prediction
+            self._prediction_cache.move_to_end(key)
+            if len(self._prediction_cache) > PREDICTION_CACHE_SIZE:
+                self._prediction_cache.popitem(last=False)
+
+    def _predict_cleaned(self, cleaned_texts: list) -> list:
+        """Predict categories for cleaned resume texts without consulting the cache."""
+        results = [("Unknown", None, 0.0) for _ in cleaned_texts]
+
+        try:
+            # Skip the texts that ended up empty after cleaning
+            indices = [i for i, text in enumerate(cleaned_texts) if text.strip()]
+
+            if not indices:
+                logger.warning("All cleaned texts are empty")
+                return results
+
+            if len(indices) == 1 and self._frozen_coef is not None:
+                # Single resume: score straight from the frozen vocabulary and weights
+                prediction_id, confidence = self._score_frozen(cleaned_texts[indices[0]])
+                prediction_ids, confidences = [prediction_id], [confidence]
+            else:
+                # Transform and predict the whole batch in one call each; the vectorizer
+                # consumes the texts lazily while building a single CSR matrix
+                features = self.vectorizer.transform(cleaned_texts[i] for i in indices)
+                prediction_ids, confidences = self._predict_features(features)
+
+            for i, prediction_id, confidence in zip(indices, prediction_ids, confidences):
+                prediction_id = int(prediction_id)
+                category_name = self.id_to_category.get(prediction_id, f"Unknown Category ({prediction_id})")
+                results[i] = (category_name, prediction_id, float(confidence))
+
+            logger.info(f"Batch prediction complete for {len(indices)} resumes")
+            return results
+
+        except Exception as e:
+            logger.error(f"Error during batch prediction: {e}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            return [("Prediction Error", None, 0.0) for _ in cleaned_texts]
+
 
 @st.cache_resource
 def get_ml_service() -> MLCategorizationService:
@@ -1,7 +1,102 @@
 """Skill extraction service using rule-based and NER methods."""
+import functools
 import re
-from typing import List, Set
-from config.settings import SKILLS_DB
+from typing import Dict, List, Set, Tuple
+from joblib import Parallel, delayed
+import streamlit as st
+from config.settings import SKILLS_DB, SKILLS_DB_LOWER
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Number of resume texts whose NER skills are kept in each extractor's LRU cache
+NER_CACHE_SIZE = 128
+# Batches at least this large extract rule-based skills across loky worker processes
+PARALLEL_EXTRACTION_MIN_BATCH = 8
+
+
+@st.cache_resource
+def get_skill_automaton():
+    """Get the Aho-Corasick automaton over the lowercased skills database (cached)."""
+    automaton = ahocorasick.Automaton()
+    for skill, skill_lower in zip(SKILLS_DB, SKILLS_DB_LOWER):
+        automaton.add_word(skill_lower, (skill_lower, skill))
+    automaton.make_automaton()
+    return automaton
+
+
+@st.cache_resource
+def get_skill_pattern() -> re.Pattern:
+    """Get one compiled alternation over the skills database, used without pyahocorasick (cached)."""
+    # Longest skills first, so "sql server" wins over "sql" at the same position
+    alternation = '|'.join(re.escape(skill) for skill in sorted(SKILLS_DB_LOWER, key=len, reverse=True))
+    # Zero-width lookahead: matches may overlap, as they do with the automaton
+    return re.compile(r'(?=\b(' + alternation + r')\b)')
+
+
+@st.cache_resource
+def get_skill_prefixes() -> Dict[str, Tuple[str, ...]]:
+    """Map each skill to the shorter skills that also match where it starts (cached)."""
+    return {
+        skill: tuple(
+            other for other in SKILLS_DB_LOWER
+            if other != skill and re.match(re.escape(other) + r'\b', skill)
+        )
+        for skill in SKILLS_DB_LOWER
+    }
+
+
+@st.cache_resource
+def get_lower_to_original() -> Dict[str, str]:
+    """Map lowercased skills back to their display names (cached)."""
+    return dict(zip(SKILLS_DB_LOWER, SKILLS_DB))
+
+
+@st.cache_resource
+def get_skill_names() -> Tuple[str, ...]:
+    """Get the distinct lowercased skills, ordered by their bit in a skill-set mask (cached)."""
+    return tuple(dict.fromkeys(SKILLS_DB_LOWER))
+
+
+@st.cache_resource
+def get_skill_index() -> Dict[str, int]:
+    """Map each lowercased skill to its bit in a skill-set mask (cached)."""
+    return {skill: bit for bit, skill in enumerate(get_skill_names())}
+
+
+@st.cache_resource
+def get_skills_db_lower() -> frozenset:
+    """Get the lowercased skills database as a set for membership tests (cached)."""
+    return frozenset(SKILLS_DB_LOWER)
+
+
+def _mask_to_skills(mask: int, skill_names: Tuple[str, ...]) -> List[str]:
+    """List the skills whose bits are set in mask, sorted by name."""
+    skills = []
+    while mask:
+        low_bit = mask & -mask
+        skills.append(skill_names[low_bit.bit_length() - 1])
+        mask ^= low_bit
+    return sorted(skills)
+
+
+def _is_word_char(char: str) -> bool:
+    """Match the definition of a word character used by regex \\b."""
+    return char.isalnum() or char == '_'
+
+
+def _has_word_boundaries(text: str, start: int, end: int) -> bool:
+    """Check that text[start:end + 1] is delimited the same way r'\\b...\\b' would be."""
+    before = _is_word_char(text[start - 1]) if start > 0 else False
+    after = _is_word_char(text[end + 1]) if end + 1 < len(text) else False
+    return before != _is_word_char(text[start]) and after != _is_word_char(text[end])
+
+
+def _extract_rule_based(resume_text: str) -> List[str]:
+    """Worker entry point; builds its own extractor so the spaCy model is never pickled."""
+    return SkillExtractor().extract_rule_based(resume_text)
 
 
 class SkillExtractor:
@@ -10,7 +105,19 @@ class SkillExtractor:
     def __init__(self, nlp_model=None):
         """Initialize skill extractor with optional spaCy model."""
         self.nlp = nlp_model
-        self.skills_db_lower = set([s.lower() for s in SKILLS_DB])
+        # Repeated NER on the same text skips the spaCy forward pass; the cache lives as long
+        # as this extractor, so the app shares one via get_skill_extractor()
+        self._extract_ner_cached = functools.lru_cache(maxsize=NER_CACHE_SIZE)(self._extract_ner)
+        self.skills_db_lower = get_skills_db_lower()
+        self.skill_index = get_skill_index()
+        self.skill_names = get_skill_names()
+        if ahocorasick is not None:
+            self.automaton = get_skill_automaton()
+        else:
+            self.automaton = None
+            self.skill_pattern = get_skill_pattern()
+            self.skill_prefixes = get_skill_prefixes()
+            self.lower_to_original = get_lower_to_original()
     
     def extract_rule_based(self, resume_text: str) -> List[str]:
         """
@@ -25,15 +132,41 @@ class SkillExtractor:
         processed_text = ' '.join(resume_text.lower().split())
         found_skills: Set[str] = set()
         
-        for skill in self.skills_db_lower:
-            skill_pattern = r"\b" + re.escape(skill) + r"\b"
-            if re.search(skill_pattern, processed_text):
-                # Find the original case skill name
-                original_skill = next((s for s in SKILLS_DB if s.lower() == skill), skill)
+        if self.automaton is None:
+            # One regex scan; nested skills sharing a start are added from the prefix table
+            for match in self.skill_pattern.finditer(processed_text):
+                skill_lower = match.group(1)
+                found_skills.add(self.lower_to_original[skill_lower])
+                found_skills.update(self.lower_to_original[prefix] for prefix in self.skill_prefixes[skill_lower])
+            return sorted(list(found_skills))
+        
+        # Single pass over the text; every hit is checked for word boundaries
+        for end, (skill_lower, original_skill) in self.automaton.iter(processed_text):
+            start = end - len(skill_lower) + 1
+            if _has_word_boundaries(processed_text, start, end):
                 found_skills.add(original_skill)
         
         return sorted(list(found_skills))
     
+    def extract_rule_based_batch(self, resume_texts: List[str]) -> List[List[str]]:
+        """
+        Extract skills from many resumes using rule-based pattern matching.
+        
+        Large batches are spread across CPU cores; small ones run inline.
+        
+        Args:
+            resume_texts: The resume texts to extract skills from
+            
+        Returns:
+            List of extracted skills for each resume, in input order
+        """
+        if len(resume_texts) < PARALLEL_EXTRACTION_MIN_BATCH:
+            return [self.extract_rule_based(text) for text in resume_texts]
+        # A Parallel instance cannot run concurrently, so each call gets its own;
+        # loky's reusable executor keeps the worker processes warm between calls
+        parallel = Parallel(n_jobs=-1, backend='loky', batch_size='auto')
+        return parallel(delayed(_extract_rule_based)(text) for text in resume_texts)
+    
     def extract_ner_based(self, resume_text: str) -> List[str]:
         """
         Extract skills using Named Entity Recognition (spaCy).
@@ -47,6 +180,10 @@ class SkillExtractor:
         if not self.nlp:
             return []
         
+        return list(self._extract_ner_cached(resume_text))
+    
+    def _extract_ner(self, resume_text: str) -> Tuple[str, ...]:
+        """Uncached implementation of extract_ner_based (immutable result for the cache)."""
         doc = self.nlp(resume_text)
         found_skills_ner: Set[str] = set()
         potential_skill_labels = {"ORG", "PRODUCT", "WORK_OF_ART", "LAW", "NORP"}
@@ -64,7 +201,7 @@ class SkillExtractor:
                     # Could add to found skills or flag for review
                     pass
         
-        return sorted(list(found_skills_ner))
+        return tuple(sorted(found_skills_ner))
     
     def extract_combined(self, resume_text: str) -> List[str]:
         """
@@ -94,18 +231,53 @@ class SkillExtractor:
         Returns:
             Dictionary with matching, missing skills and score
         """
-        resume_skills_set = set(s.lower() for s in resume_skills)
-        jd_skills_set = set(s.lower() for s in jd_skills)
+        # Skill sets as bitmasks over the skills database; skills outside it get bits
+        # past the end for this call only
+        extra_index = {}
+        
+        def to_mask(skills: List[str]) -> int:
+            mask = 0
+            for skill in skills:
+                skill_lower = skill.lower()
+                bit = self.skill_index.get(skill_lower)
+                if bit is None:
+                    bit = extra_index.get(skill_lower)
+                    if bit is None:
+                        bit = extra_index[skill_lower] = len(self.skill_names) + len(extra_index)
+                mask |= 1 << bit
+            return mask
+        
+        resume_mask = to_mask(resume_skills)
+        jd_mask = to_mask(jd_skills)
+        
+        matching_mask = resume_mask & jd_mask
+        missing_mask = jd_mask & ~resume_mask
         
-        matching_skills = resume_skills_set.intersection(jd_skills_set)
-        missing_skills = jd_skills_set.difference(resume_skills_set)
+        # Population counts (bin().count keeps Python 3.8 support; int.bit_count is 3.10+)
+        total_jd_skills = bin(jd_mask).count('1')
+        matched_count = bin(matching_mask).count('1')
         
-        score = (len(matching_skills) / len(jd_skills_set)) * 100 if jd_skills_set else 0
+        score = (matched_count / total_jd_skills) * 100 if total_jd_skills else 0
+        
+        # The cached name table is only extended (copied) when unknown skills were seen
+        skill_names = self.skill_names + tuple(extra_index) if extra_index else self.skill_names
         
         return {
             'score': round(score, 2),
-            'matching_skills': sorted(list(matching_skills)),
-            'missing_skills': sorted(list(missing_skills)),
-            'total_jd_skills': len(jd_skills_set),
-            'matched_count': len(matching_skills)
+            'matching_skills': _mask_to_skills(matching_mask, skill_names),
+            'missing_skills': _mask_to_skills(missing_mask, skill_names),
+            'total_jd_skills': total_jd_skills,
+            'matched_count': matched_count
         }
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def extract_combined_cached(_extractor: SkillExtractor, resume_text: str) -> List[str]:
+    """Run SkillExtractor.extract_combined, cached on the resume text."""
+    return _extractor.extract_combined(resume_text)
+
+
+@st.cache_resource
+def get_skill_extractor(_nlp_model=None) -> SkillExtractor:
+    """Get the process-wide skill extractor, so its NER cache survives reruns (cached)."""
+    return SkillExtractor(_nlp_model)
@@ -0,0 +1,134 @@
+"""Text summarization service using transformer models."""
+import os
+import shutil
+from pathlib import Path
+import logging
+
+from config.settings import SUMMARIZER_CACHE_DIR, SUMMARIZER_MODEL
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# ONNX graphs produced by optimum's seq2seq export
+ONNX_COMPONENTS = {
+    'encoder_file_name': 'encoder_model.onnx',
+    'decoder_file_name': 'decoder_model.onnx',
+    'decoder_with_past_file_name': 'decoder_with_past_model.onnx',
+}
+
+
+def _quantized_name(file_name: str) -> str:
+    """Name ORTQuantizer gives to the quantized version of an ONNX file."""
+    return f"{Path(file_name).stem}_quantized.onnx"
+
+
+def _export_quantized_model(model_id: str, save_dir: Path):
+    """
+    Export a seq2seq model to ONNX and quantize its weights to INT8.
+
+    Args:
+        model_id: Hugging Face model identifier
+        save_dir: Directory where the quantized model and tokenizer are written
+    """
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    export_dir = save_dir / "fp32"
+    logger.info(f"Exporting {model_id} to ONNX in {export_dir}")
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_id, export=True)
+    model.save_pretrained(export_dir)
+    AutoTokenizer.from_pretrained(model_id).save_pretrained(save_dir)
+
+    # Dynamic INT8 quantization; VNNI kernels are used when the CPU has them
+    quantization_config = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    for file_name in ONNX_COMPONENTS.values():
+        if (export_dir / file_name).exists():
+            quantizer = ORTQuantizer.from_pretrained(export_dir, file_name=file_name)
+            quantizer.quantize(save_dir=save_dir, quantization_config=quantization_config)
+
+    model.config.save_pretrained(save_dir)
+    if getattr(model, 'generation_config', None) is not None:
+        model.generation_config.save_pretrained(save_dir)
+
+    # Only the quantized graphs are loaded; don't keep a second, FP32 copy on disk
+    shutil.rmtree(export_dir, ignore_errors=True)
+
+
+def _load_onnx_pipeline(model_id: str):
+    """Load (exporting on first use) an INT8 ONNX Runtime summarization pipeline."""
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    from transformers import AutoTokenizer, pipeline
+
+    save_dir = Path(SUMMARIZER_CACHE_DIR) / f"{model_id.replace('/', '--')}-onnx-int8"
+    file_names = {
+        arg: _quantized_name(file_name)
+        for arg, file_name in ONNX_COMPONENTS.items()
+    }
+
+    if not (save_dir / file_names['encoder_file_name']).exists():
+        _export_quantized_model(model_id, save_dir)
+
+    model = ORTModelForSeq2SeqLM.from_pretrained(
+        save_dir,
+        provider="CPUExecutionProvider",
+        **{arg: name for arg, name in file_names.items() if (save_dir / name).exists()}
+    )
+    tokenizer = AutoTokenizer.from_pretrained(save_dir)
+    return pipeline("summarization", model=model, tokenizer=tokenizer, truncation=True)
+
+
+def _load_torch_pipeline(model_id: str):
+    """Load a PyTorch summarization pipeline from a local safetensors copy of the model."""
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+
+    # Use every core for the CPU forward passes
+    torch.set_num_threads(os.cpu_count() or 1)
+
+    save_dir = Path(SUMMARIZER_CACHE_DIR) / f"{model_id.replace('/', '--')}-safetensors"
+    if not (save_dir / "model.safetensors").exists():
+        logger.info(f"Saving {model_id} as safetensors in {save_dir}")
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_id)
+        tokenizer = AutoTokenizer.from_pretrained(model_id)
+        try:
+            model.save_pretrained(save_dir, safe_serialization=True)
+            tokenizer.save_pretrained(save_dir)
+        except OSError as e:
+            # Read-only or full disk: the Hub model is already in memory, so just use it;
+            # drop any partial copy so the next start does not load it
+            logger.warning(f"Could not cache {model_id} in {save_dir}, using the Hub copy: {e}")
+            shutil.rmtree(save_dir, ignore_errors=True)
+    else:
+        # Later cold starts memory-map the local weights instead of resolving the Hub
+        model = AutoModelForSeq2SeqLM.from_pretrained(save_dir, use_safetensors=True)
+        tokenizer = AutoTokenizer.from_pretrained(save_dir)
+
+    model.eval()
+    return pipeline("summarization", model=model, tokenizer=tokenizer, truncation=True)
+
+
+def load_summarization_pipeline(model_id: str = SUMMARIZER_MODEL):
+    """
+    Load the summarization pipeline.
+
+    Prefers an INT8-quantized ONNX Runtime model (requires optimum[onnxruntime])
+    and falls back to the PyTorch transformers pipeline, loaded from a local
+    safetensors copy, otherwise.
+
+    Args:
+        model_id: Hugging Face model identifier
+
+    Returns:
+        A transformers summarization pipeline
+    """
+    try:
+        summarizer = _load_onnx_pipeline(model_id)
+        logger.info(f"Loaded INT8 ONNX summarizer for {model_id}")
+        return summarizer
+    except ImportError:
+        logger.info("optimum[onnxruntime] not installed - using PyTorch summarizer")
+    except Exception as e:
+        logger.warning(f"Failed to load ONNX summarizer, falling back to PyTorch: {e}")
+
+    return _load_torch_pipeline(model_id)
@@ -1,55 +1,99 @@
 """Text processing and cleaning utilities."""
+import functools
 import re
 from typing import List
 from nltk.corpus import stopwords
 
+_PUNCTUATION = r"""!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~"""
+# Punctuation to spaces as a str.translate table: a C lookup per character, no regex engine
+_PUNCT_TABLE = str.maketrans(dict.fromkeys(_PUNCTUATION, ' '))
+
+# Patterns compiled once at import instead of looked up in the re cache on every call
+_RE_URL = re.compile(r'http\S+\s')
+_RE_RTCC = re.compile(r'RT|cc')
+_RE_RTCC_LOWER = re.compile(r'rt|cc')
+_RE_HASHTAG = re.compile(r'#\S+')
+_RE_HASHTAG_WS = re.compile(r'#\S+\s')
+_RE_MENTION = re.compile(r'@\S+')
+_RE_NON_ASCII = re.compile(r'[^\x00-\x7f]')
+_RE_WHITESPACE = re.compile(r'\s+')
+# Punctuation and non-ASCII both become spaces and whitespace runs then collapse,
+# so one pass over any run of the three yields the same single space
+_RE_SEPARATOR_RUN = re.compile(r'[\s%s\x80-\U0010ffff]+' % re.escape(_PUNCTUATION))
+_RE_EMAIL = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_RE_PHONE = re.compile(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]')
+_RE_URL_EXTRACT = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+
+# English stopwords, loaded from the NLTK corpus on first use
+_STOPWORDS = None
+
 
 def clean_text_general(txt: str) -> str:
     """General text cleaning function."""
     txt = str(txt).lower()
-    txt = re.sub('http\S+\s', ' ', txt)
-    txt = re.sub('rt|cc', ' ', txt)
-    txt = re.sub('#\S+', '', txt)
-    txt = re.sub('@\S+', '  ', txt)
-    txt = re.sub('[%s]' % re.escape("""!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~"""), ' ', txt)
-    txt = re.sub(r'[^\x00-\x7f]', ' ', txt)
-    txt = re.sub('\s+', ' ', txt)
+    txt = _RE_URL.sub(' ', txt)
+    txt = _RE_RTCC_LOWER.sub(' ', txt)
+    txt = _RE_HASHTAG.sub('', txt)
+    txt = _RE_MENTION.sub('  ', txt)
+    txt = txt.translate(_PUNCT_TABLE)
+    if not txt.isascii():
+        txt = _RE_NON_ASCII.sub(' ', txt)
+    txt = _RE_WHITESPACE.sub(' ', txt)
     return txt.strip()
 
 
+# Resumes at least this long are cleaned without caching to bound the cache's memory
+CLEAN_CACHE_MAX_CHARS = 100_000
+
+
 def clean_resume_for_categorization(txt: str, remove_stopwords: bool = False) -> str:
     """
     Clean resume text specifically for ML categorization.
     This should match the preprocessing used during model training.
+    
+    Results are memoized per process, so re-scoring the same resume skips the regex passes.
     """
-    clean_text = re.sub('http\S+\s', ' ', txt)
-    clean_text = re.sub('RT|cc', ' ', clean_text)
-    clean_text = re.sub('#\S+\s', ' ', clean_text)
-    clean_text = re.sub('@\S+', '  ', clean_text)
-    clean_text = re.sub('[%s]' % re.escape("""!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~"""), ' ', clean_text)
-    clean_text = re.sub(r'[^\x00-\x7f]', ' ', clean_text)
-    clean_text = re.sub('\s+', ' ', clean_text)
+    if isinstance(txt, str) and len(txt) < CLEAN_CACHE_MAX_CHARS:
+        return _clean_resume_cached(txt, remove_stopwords)
+    return _clean_resume(txt, remove_stopwords)
+
+
+def _clean_resume(txt: str, remove_stopwords: bool = False) -> str:
+    """Uncached implementation of clean_resume_for_categorization."""
+    clean_text = _RE_URL.sub(' ', txt)
+    clean_text = _RE_RTCC.sub(' ', clean_text)
+    clean_text = _RE_HASHTAG_WS.sub(' ', clean_text)
+    clean_text = _RE_MENTION.sub('  ', clean_text)
+    clean_text = _RE_SEPARATOR_RUN.sub(' ', clean_text)
     
     if remove_stopwords:
-        stop_words = set(stopwords.words('english'))
+        stop_words = _get_stopwords()
         clean_text = ' '.join(word for word in clean_text.split() if word.lower() not in stop_words)
     
     return clean_text.lower()
 
 
+def _get_stopwords() -> frozenset:
+    """Get the English stopwords, reading the NLTK corpus only once per process."""
+    global _STOPWORDS
+    if _STOPWORDS is None:
+        _STOPWORDS = frozenset(stopwords.words('english'))
+    return _STOPWORDS
+
+
+_clean_resume_cached = functools.lru_cache(maxsize=1024)(_clean_resume)
+
+
 def extract_emails(text: str) -> List[str]:
     """Extract email addresses from text."""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    return re.findall(email_pattern, text)
+    return _RE_EMAIL.findall(text)
 
 
 def extract_phone_numbers(text: str) -> List[str]:
     """Extract phone numbers from text."""
-    phone_pattern = r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]'
-    return re.findall(phone_pattern, text)
+    return _RE_PHONE.findall(text)
 
 
 def extract_urls(text: str) -> List[str]:
     """Extract URLs from text."""
-    url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-    return re.findall(url_pattern, text)
+    return _RE_URL_EXTRACT.findall(text)
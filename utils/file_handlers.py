@@ -1,37 +1,52 @@
 """File handling utilities for document processing."""
+import io
+import mmap
 import os
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 from pypdf import PdfReader
 from docx import Document
 import streamlit as st
 
 
-def read_pdf(file_path: str) -> str:
+def read_pdf(file: Union[str, BinaryIO]) -> str:
     """
     Extract text from PDF file.
     
     Args:
-        file_path: Path to PDF file
+        file: Path to PDF file or binary file-like object
         
     Returns:
         Extracted text
     """
-    text = ""
+    name = os.path.basename(file) if isinstance(file, str) else getattr(file, 'name', 'document')
+    page_texts = []
     try:
-        reader = PdfReader(file_path)
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
+        if isinstance(file, str):
+            # Map the file so the parser's xref seeks are served from the page cache
+            with open(file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                page_texts = _extract_page_texts(PdfReader(mm))
+        else:
+            page_texts = _extract_page_texts(PdfReader(file))
     except Exception as e:
-        st.error(f"Error reading PDF {os.path.basename(file_path)}: {e}")
+        st.error(f"Error reading PDF {name}: {e}")
     
+    text = "".join(f"{page_text}\n" for page_text in page_texts)
     if not text:
-        st.warning(f"Could not extract text from {os.path.basename(file_path)}")
+        st.warning(f"Could not extract text from {name}")
     
     return text
 
 
+def _extract_page_texts(reader: PdfReader) -> list:
+    """Extract the non-empty text of each page of an open PDF."""
+    page_texts = []
+    for page in reader.pages:
+        page_text = page.extract_text()
+        if page_text:
+            page_texts.append(page_text)
+    return page_texts
+
+
 def read_docx(file) -> str:
     """
     Extract text from DOCX file.
@@ -44,7 +59,13 @@ def read_docx(file) -> str:
     """
     try:
         doc = Document(file)
-        text = "\n".join([para.text for para in doc.paragraphs])
+        # Write paragraphs straight into one buffer instead of collecting them in a list
+        buffer = io.StringIO()
+        for i, para in enumerate(doc.paragraphs):
+            if i:
+                buffer.write("\n")
+            buffer.write(para.text)
+        text = buffer.getvalue()
         
         if not text:
             st.warning(f"Could not extract text from DOCX {getattr(file, 'name', 'document')}")
@@ -55,6 +76,30 @@ def read_docx(file) -> str:
         return ""
 
 
+@st.cache_data(max_entries=128, show_spinner=False)
+def extract_text_cached(file_hash: str, file_name: str, _file_bytes: bytes) -> str:
+    """
+    Extract text from an uploaded PDF/DOCX, cached on the file's content hash.
+    
+    Args:
+        file_hash: SHA-256 hex digest of the file bytes (used as cache key)
+        file_name: Original filename, used to pick the parser
+        _file_bytes: Raw file content (not hashed by Streamlit)
+        
+    Returns:
+        Extracted text
+    """
+    buffer = io.BytesIO(_file_bytes)
+    buffer.name = file_name
+    
+    file_ext = get_file_extension(file_name)
+    if file_ext == '.pdf':
+        return read_pdf(buffer)
+    if file_ext == '.docx':
+        return read_docx(buffer)
+    return ""
+
+
 def save_uploaded_file(uploaded_file, destination_path: str) -> bool:
     """
     Save an uploaded file to disk.
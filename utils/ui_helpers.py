@@ -1,16 +1,24 @@
 """UI helper functions for Streamlit."""
 import base64
+import io
 import streamlit as st
 import pandas as pd
 from typing import List, Tuple
 import random
 
+# Raw bytes base64-encoded per chunk; a multiple of 3 so no chunk but the last is padded
+PDF_ENCODE_CHUNK_SIZE = 48 * 1024
+
 
 def show_pdf_inline(file_path: str):
     """Display PDF file inline in Streamlit."""
     try:
+        # Encode while reading, so the raw file is never held in memory next to its encoding
+        encoded = io.BytesIO()
         with open(file_path, "rb") as f:
-            base64_pdf = base64.b64encode(f.read()).decode('utf-8')
+            for chunk in iter(lambda: f.read(PDF_ENCODE_CHUNK_SIZE), b""):
+                encoded.write(base64.b64encode(chunk))
+        base64_pdf = encoded.getvalue().decode('ascii')
         
         pdf_display = f'<iframe src="data:application/pdf;base64,{base64_pdf}" width="700" height="1000" type="application/pdf"></iframe>'
         st.markdown(pdf_display, unsafe_allow_html=True)
@@ -20,12 +28,11 @@ def show_pdf_inline(file_path: str):
         st.error(f"Error displaying PDF: {e}")
 
 
-def get_table_download_link(df: pd.DataFrame, filename: str, link_text: str) -> str:
-    """Generate download link for dataframe as CSV."""
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">{link_text}</a>'
-    return href
+def dataframe_to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """Serialize a dataframe to UTF-8 CSV bytes without an intermediate str copy."""
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False, encoding='utf-8')
+    return buffer.getvalue()
 
 
 def display_course_recommendations(course_list: List[Tuple[str, str]], num_recommendations: int = 4) -> List[str]:
@@ -45,13 +52,12 @@ def display_course_recommendations(course_list: List[Tuple[str, str]], num_recom
     displayed_courses = []
     
     try:
-        # Shuffle for variety
-        shuffled_courses = course_list.copy()
-        random.shuffle(shuffled_courses)
+        # Random picks for variety, drawn without copying or shuffling the whole list
+        picked_courses = random.sample(course_list, min(num_recommendations, len(course_list)))
         
         st.markdown("### 📚 Recommended Courses")
         
-        for i, (c_name, c_link) in enumerate(shuffled_courses[:num_recommendations], 1):
+        for i, (c_name, c_link) in enumerate(picked_courses, 1):
             st.markdown(f"{i}. [{c_name}]({c_link})")
             displayed_courses.append(c_name)
     